@@ -0,0 +1,240 @@
+import os
+import threading
+import time
+from typing import Callable, Dict, Tuple, Union
+
+from .file_event import FileEvent
+
+
+class EventCoalescer:
+    """Merges the burst of events a single change produces into one logical event.
+
+    File system changes rarely produce a single event. Creating a file is often
+    reported as "created" followed by one or more "modified" events for the file
+    and a "modified" event for the parent directory. The coalescer holds events for
+    each path for a settle window, merges events for the same path as they arrive,
+    and only emits the merged event once the window closes.
+
+    Events for the same path are merged as follows:
+
+    - created then modified: created
+    - modified then modified: modified
+    - created then deleted: both are dropped (a short lived temporary file)
+    - modified then deleted: deleted
+    - deleted then created: modified (the file was replaced)
+    - moved then modified (at the destination): moved
+
+    A "modified" event for a directory is dropped when one of the directory's
+    children had an event within the settle window, since it only reports that
+    the directory listing changed. It is also dropped when one of its siblings had
+    an event, which is how a file moved into an unwatched sub-directory shows up.
+
+    Each path is emitted at most ``settle_window`` seconds after its first event.
+    Events are emitted in the order their paths were first seen.
+    """
+
+    def __init__(
+        self, emit: Callable[[FileEvent], None], settle_window: float = 0.5
+    ) -> None:
+        """Creates an EventCoalescer
+
+        Args:
+            emit (Callable[[FileEvent], None]): Called with each coalesced event
+              once its settle window closes.
+            settle_window (float, optional): Number of seconds events for a path are
+              held and merged before being emitted. Defaults to 0.5.
+
+        Raises:
+            ValueError: Raised when settle_window is negative.
+        """
+        if settle_window < 0:
+            raise ValueError("settle_window cannot be negative")
+
+        self.__emit = emit
+        self.__settle_window = settle_window
+        # path -> (deadline, event). Deadlines are assigned when a path is first
+        # added, so insertion order is also deadline order.
+        self.__pending: Dict[str, Tuple[float, FileEvent]] = {}
+        # directory -> last time one of its children had an event.
+        self.__child_activity: Dict[str, float] = {}
+        self.__lock = threading.Lock()
+        self.__emit_lock = threading.Lock()
+        self.__wakeup = threading.Condition(self.__lock)
+        self.__thread: Union[threading.Thread, None] = None
+        self.__closed = False
+
+    @property
+    def settle_window(self) -> float:
+        """Seconds events for a path are held before being emitted."""
+        return self.__settle_window
+
+    @property
+    def pending(self) -> int:
+        """The number of paths with an event waiting to be emitted."""
+        return len(self.__pending)
+
+    def add(self, event: FileEvent) -> None:
+        """Adds an event, merging it with any pending event for the same path.
+
+        Args:
+            event (FileEvent): The event being added.
+        """
+        now = time.monotonic()
+        location = os.path.normpath(event.event_location)
+        with self.__lock:
+            if event.event_type == "modified" and event.dir_event:
+                if self.__recently_active(location, now) or self.__recently_active(
+                    os.path.dirname(location), now
+                ):
+                    return
+            else:
+                self.__touch_parent(location, now)
+
+            if event.event_type == "moved":
+                key = os.path.normpath(event.file_destination)
+                self.__touch_parent(key, now)
+                previous = self.__pending.pop(location, None)
+                if previous is not None:
+                    event = self._follow_move(previous[1], event)
+            else:
+                key = location
+
+            previous = self.__pending.get(key)
+            if previous is None:
+                self.__pending[key] = (now + self.__settle_window, event)
+            else:
+                merged = self._merge(previous[1], event)
+                if merged is None:
+                    del self.__pending[key]
+                elif merged is not previous[1]:
+                    self.__pending[key] = (previous[0], merged)
+
+            self.__ensure_thread()
+            self.__wakeup.notify()
+
+    def __recently_active(self, directory: str, now: float) -> bool:
+        """Checks if a child of directory had an event within the settle window."""
+        last_seen = self.__child_activity.get(directory)
+        return last_seen is not None and now - last_seen < self.__settle_window
+
+    def __touch_parent(self, path: str, now: float) -> None:
+        """Records activity in the parent directory of path.
+
+        Drops a pending "modified" event for the parent, since it was caused by the
+        change to path.
+        """
+        parent = os.path.dirname(path)
+        self.__child_activity[parent] = now
+        pending_parent = self.__pending.get(parent)
+        if (
+            pending_parent is not None
+            and pending_parent[1].event_type == "modified"
+            and pending_parent[1].dir_event
+        ):
+            del self.__pending[parent]
+
+    def flush(self) -> None:
+        """Emits every pending event immediately."""
+        self.__emit_ready(flush=True)
+
+    def close(self) -> None:
+        """Emits pending events and stops the background thread."""
+        with self.__lock:
+            self.__closed = True
+            self.__wakeup.notify()
+            thread, self.__thread = self.__thread, None
+        if thread is not None:
+            thread.join()
+        self.flush()
+
+    @staticmethod
+    def _merge(
+        previous: FileEvent, current: FileEvent
+    ) -> Union[FileEvent, None]:
+        """Merges two events for the same path.
+
+        Returns:
+            Union[FileEvent, None]: The event that should remain pending, or None
+              if the events cancel each other out.
+        """
+        kinds = (previous.event_type, current.event_type)
+        if kinds == ("created", "deleted"):
+            return None
+        if current.event_type == "modified" and previous.event_type in (
+            "created",
+            "modified",
+            "moved",
+        ):
+            return previous
+        if kinds == ("created", "created"):
+            return previous
+        if kinds == ("deleted", "created"):
+            return current.replace(event_type="modified")
+        return current
+
+    @staticmethod
+    def _follow_move(previous: FileEvent, moved: FileEvent) -> FileEvent:
+        """Combines a pending event for the source of a move with the move.
+
+        Returns:
+            FileEvent: A created event at the destination if the source was just
+              created, otherwise a move from the original source.
+        """
+        if previous.event_type == "created":
+            return previous.replace(
+                event_location=moved.file_destination,
+                file_type=os.path.splitext(moved.file_destination)[1],
+            )
+        if previous.event_type == "moved":
+            return previous.replace(file_destination=moved.file_destination)
+        return moved
+
+    def __ensure_thread(self) -> None:
+        """Starts the background thread that emits events once they settle."""
+        if self.__thread is None and not self.__closed:
+            self.__thread = threading.Thread(
+                target=self._run, name="filewatch-coalescer", daemon=True
+            )
+            self.__thread.start()
+
+    def _run(self) -> None:
+        """Background loop emitting events whose settle window has closed."""
+        while True:
+            with self.__lock:
+                if self.__closed:
+                    return
+                now = time.monotonic()
+                for directory, last_seen in list(self.__child_activity.items()):
+                    if now - last_seen >= self.__settle_window:
+                        del self.__child_activity[directory]
+                if self.__pending:
+                    timeout = next(iter(self.__pending.values()))[0] - now
+                else:
+                    timeout = None
+                if timeout is None or timeout > 0:
+                    self.__wakeup.wait(timeout)
+                    continue
+            self.__emit_ready()
+
+    def __emit_ready(self, flush: bool = False) -> None:
+        """Emits the events whose settle window has closed, or all events if flush.
+
+        Collecting and emitting happen under one lock so events are always emitted
+        in order, whichever thread emits them.
+        """
+        with self.__emit_lock:
+            with self.__lock:
+                now = time.monotonic()
+                if flush:
+                    ready = [event for _, event in self.__pending.values()]
+                    self.__pending.clear()
+                    self.__child_activity.clear()
+                else:
+                    ready = []
+                    for key, (deadline, event) in list(self.__pending.items()):
+                        if deadline > now:
+                            break
+                        ready.append(event)
+                        del self.__pending[key]
+            for event in ready:
+                self.__emit(event)
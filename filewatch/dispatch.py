@@ -0,0 +1,458 @@
+import collections
+import itertools
+import threading
+from typing import Callable, Dict, List, Sequence, Union
+
+OVERFLOW_POLICIES = ("block", "drop-oldest", "drop-modifies-first", "coalesce")
+
+# Outcomes of EventQueue.__make_room.
+_HANDLED = "handled"
+_ROOM_MADE = "room made"
+_WAIT = "wait"
+
+
+class ObserverDispatcher:
+    """Delivers events to the observers registered with a FileHandler.
+
+    The base dispatcher calls each observer's notify method directly on the
+    thread that detected the event. It is the default used by FileHandler and
+    matches the original behavior.
+    """
+
+    @property
+    def pending(self) -> int:
+        """The number of queued deliveries that have not been started yet."""
+        return 0
+
+    @property
+    def dropped(self) -> int:
+        """The number of deliveries discarded by the overflow policy."""
+        return 0
+
+    @property
+    def coalesced(self) -> int:
+        """The number of deliveries merged into already queued deliveries."""
+        return 0
+
+    def assign(self, observer) -> None:
+        """Called when an observer is registered with the handler."""
+
+    def release(self, observer) -> None:
+        """Called when an observer is removed from the handler."""
+
+    def dispatch(self, event, observers: Sequence) -> None:
+        """Delivers an event to the given observers.
+
+        Args:
+            event: The event being delivered.
+            observers (Sequence): The observers that should be notified.
+        """
+        for observer in observers:
+            observer.notify(event)
+
+    def dispatch_batch(self, events: list, observers: Sequence) -> None:
+        """Delivers a batch of events to observers implementing notify_batch.
+
+        Args:
+            events (list): The events being delivered, oldest first.
+            observers (Sequence): The observers that should be notified.
+        """
+        for observer in observers:
+            observer.notify_batch(events)
+
+    def flush(self) -> None:
+        """Blocks until every event dispatched so far has been delivered."""
+
+    def close(self) -> None:
+        """Delivers outstanding events and releases any resources."""
+
+
+class EventQueue:
+    """Bounded FIFO queue of deliveries with a configurable overflow policy.
+
+    Each item is a (payload, observers, batch) tuple. The overflow policy decides
+    what happens when an item is put on a full queue:
+
+    - "block": wait until the consumer makes room.
+    - "drop-oldest": discard the oldest queued item.
+    - "drop-modifies-first": discard the oldest queued "modified" event, or the
+      new item if it is a "modified" event. Waits if neither is possible, so
+      created, deleted and moved events are never lost.
+    - "coalesce": discard the new item if it is a "modified" event for a path
+      that already has a "modified" event queued for the same observers. Waits
+      otherwise.
+
+    The number of dropped and coalesced items is counted.
+    """
+
+    def __init__(self, maxsize: int, policy: str = "block") -> None:
+        """Creates an EventQueue
+
+        Args:
+            maxsize (int): The maximum number of queued items.
+            policy (str, optional): The overflow policy. One of OVERFLOW_POLICIES.
+              Defaults to "block".
+
+        Raises:
+            ValueError: Raised when maxsize is less than one or the policy is not
+              known.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+
+        self.__maxsize = maxsize
+        self.__policy = policy
+        self.__items: collections.deque = collections.deque()
+        self.__unfinished = 0
+        self.__dropped = 0
+        self.__coalesced = 0
+        self.__lock = threading.Lock()
+        self.__not_empty = threading.Condition(self.__lock)
+        self.__not_full = threading.Condition(self.__lock)
+        self.__all_done = threading.Condition(self.__lock)
+
+    @property
+    def policy(self) -> str:
+        """The overflow policy."""
+        return self.__policy
+
+    @property
+    def dropped(self) -> int:
+        """The number of events discarded because the queue was full."""
+        return self.__dropped
+
+    @property
+    def coalesced(self) -> int:
+        """The number of events merged into an already queued event."""
+        return self.__coalesced
+
+    def qsize(self) -> int:
+        """The number of queued items."""
+        return len(self.__items)
+
+    def put(self, item: tuple) -> None:
+        """Adds an item, applying the overflow policy when the queue is full."""
+        with self.__not_full:
+            while len(self.__items) >= self.__maxsize:
+                outcome = self.__make_room(item)
+                if outcome == _HANDLED:
+                    return
+                if outcome == _WAIT:
+                    self.__not_full.wait()
+            self.__append(item)
+
+    def close(self) -> None:
+        """Queues the None sentinel that stops the consumer, ignoring the limit."""
+        with self.__lock:
+            self.__append(None)
+
+    def get(self) -> Union[tuple, None]:
+        """Removes and returns the oldest item, waiting for one if necessary."""
+        with self.__not_empty:
+            while not self.__items:
+                self.__not_empty.wait()
+            item = self.__items.popleft()
+            self.__not_full.notify()
+            return item
+
+    def task_done(self) -> None:
+        """Marks an item returned by get as delivered."""
+        with self.__lock:
+            self.__unfinished -= 1
+            if self.__unfinished <= 0:
+                self.__all_done.notify_all()
+
+    def join(self) -> None:
+        """Blocks until every queued item has been delivered."""
+        with self.__all_done:
+            while self.__unfinished:
+                self.__all_done.wait()
+
+    def __append(self, item) -> None:
+        self.__items.append(item)
+        self.__unfinished += 1
+        self.__not_empty.notify()
+
+    def __discard(self, item) -> None:
+        """Accounts for an item that will never be delivered."""
+        self.__dropped += len(item[0]) if item[2] else 1
+
+    def __make_room(self, item: tuple) -> str:
+        """Applies the overflow policy to a full queue.
+
+        Returns:
+            str: _HANDLED if the new item was dropped or coalesced, _ROOM_MADE if a
+              queued item was dropped so the new item can be appended, or _WAIT if
+              the caller must wait for the consumer.
+        """
+        if self.__policy == "drop-oldest":
+            self.__remove(0)
+            return _ROOM_MADE
+
+        if self.__policy == "drop-modifies-first":
+            for index, queued in enumerate(self.__items):
+                if self._is_modify(queued):
+                    self.__remove(index)
+                    return _ROOM_MADE
+            if self._is_modify(item):
+                self.__discard(item)
+                return _HANDLED
+
+        if self.__policy == "coalesce" and self._is_modify(item):
+            for queued in self.__items:
+                if (
+                    self._is_modify(queued)
+                    and queued[0].event_location == item[0].event_location
+                    and queued[1] == item[1]
+                ):
+                    self.__coalesced += 1
+                    return _HANDLED
+        return _WAIT
+
+    def __remove(self, index: int) -> None:
+        """Drops a queued item so a new one fits."""
+        queued = self.__items[index]
+        del self.__items[index]
+        self.__unfinished -= 1
+        self.__discard(queued)
+
+    @staticmethod
+    def _is_modify(item) -> bool:
+        return item is not None and not item[2] and item[0].event_type == "modified"
+
+
+class AsyncDispatcher(ObserverDispatcher):
+    """Delivers events to observers from a pool of worker threads.
+
+    Dispatching an event only places it on a queue, so the thread that detects
+    file system events is never held up by slow observers (e.g. ones writing to a
+    database or updating a GUI).
+
+    Each observer is assigned to exactly one worker when it is registered. A
+    worker delivers events in the order they were queued, so every observer sees
+    events in the order they were detected. Different observers may be notified
+    by different workers and can run concurrently.
+
+    Each worker has a bounded EventQueue. What happens when a queue is full is
+    decided by the overflow policy (see EventQueue). The default blocks until the
+    worker catches up.
+    """
+
+    def __init__(
+        self, workers: int = 1, queue_size: int = 1000, overflow_policy: str = "block"
+    ) -> None:
+        """Creates an AsyncDispatcher and starts its worker threads.
+
+        Args:
+            workers (int, optional): The number of worker threads. Defaults to 1.
+            queue_size (int, optional): The maximum number of events waiting to
+              be delivered by each worker. Defaults to 1000.
+            overflow_policy (str, optional): What to do when a worker's queue is
+              full. One of OVERFLOW_POLICIES. Defaults to "block".
+
+        Raises:
+            ValueError: Raised when workers or queue_size are less than one or the
+              overflow policy is not known.
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+
+        self.__queues: List[EventQueue] = [
+            EventQueue(queue_size, overflow_policy) for _ in range(workers)
+        ]
+        self.__assignments: Dict[int, int] = {}
+        self.__next_worker = itertools.cycle(range(workers))
+        self.__lock = threading.Lock()
+        self.__threads = [
+            threading.Thread(
+                target=self._deliver,
+                args=(q,),
+                name=f"filewatch-dispatch-{i}",
+                daemon=True,
+            )
+            for i, q in enumerate(self.__queues)
+        ]
+        for thread in self.__threads:
+            thread.start()
+
+    @property
+    def workers(self) -> int:
+        """The number of worker threads delivering events."""
+        return len(self.__threads)
+
+    @property
+    def pending(self) -> int:
+        """The number of queued deliveries that have not been started yet."""
+        return sum(q.qsize() for q in self.__queues)
+
+    @property
+    def dropped(self) -> int:
+        """The number of deliveries discarded by the overflow policy."""
+        return sum(q.dropped for q in self.__queues)
+
+    @property
+    def coalesced(self) -> int:
+        """The number of deliveries merged into already queued deliveries."""
+        return sum(q.coalesced for q in self.__queues)
+
+    def assign(self, observer) -> None:
+        """Assigns an observer to a worker using round robin."""
+        with self.__lock:
+            if id(observer) not in self.__assignments:
+                self.__assignments[id(observer)] = next(self.__next_worker)
+
+    def release(self, observer) -> None:
+        """Removes the worker assignment for an observer."""
+        with self.__lock:
+            self.__assignments.pop(id(observer), None)
+
+    def dispatch(self, event, observers: Sequence) -> None:
+        """Queues an event for delivery to the given observers.
+
+        Args:
+            event: The event being delivered.
+            observers (Sequence): The observers that should be notified.
+
+        Raises:
+            RuntimeError: Raised when the dispatcher has been closed.
+        """
+        self._enqueue(event, observers, False)
+
+    def dispatch_batch(self, events: list, observers: Sequence) -> None:
+        """Queues a batch of events for delivery to observers implementing
+        notify_batch.
+
+        Args:
+            events (list): The events being delivered, oldest first.
+            observers (Sequence): The observers that should be notified.
+
+        Raises:
+            RuntimeError: Raised when the dispatcher has been closed.
+        """
+        self._enqueue(events, observers, True)
+
+    def _enqueue(self, payload, observers: Sequence, batch: bool) -> None:
+        """Places a delivery on the queue of each worker owning an observer."""
+        if not self.__threads:
+            raise RuntimeError("Dispatcher has been closed")
+
+        by_worker: Dict[int, list] = {}
+        for observer in observers:
+            worker = self.__assignments.get(id(observer))
+            if worker is None:
+                self.assign(observer)
+                worker = self.__assignments[id(observer)]
+            by_worker.setdefault(worker, []).append(observer)
+
+        for worker, targets in by_worker.items():
+            self.__queues[worker].put((payload, targets, batch))
+
+    def flush(self) -> None:
+        """Blocks until every queued event has been delivered."""
+        for q in self.__queues:
+            q.join()
+
+    def close(self) -> None:
+        """Delivers the queued events and stops the worker threads."""
+        threads, self.__threads = self.__threads, []
+        for q in self.__queues[: len(threads)]:
+            q.close()
+        for thread in threads:
+            thread.join()
+
+    @staticmethod
+    def _deliver(work: EventQueue) -> None:
+        """Worker loop. Delivers queued events until a None is received."""
+        while True:
+            item = work.get()
+            try:
+                if item is None:
+                    return
+                payload, observers, batch = item
+                for observer in observers:
+                    try:
+                        if batch:
+                            observer.notify_batch(payload)
+                        else:
+                            observer.notify(payload)
+                    except Exception as e:
+                        print(f"Observer error: {e}")
+            finally:
+                work.task_done()
+
+
+class EventBatcher:
+    """Accumulates events and hands them on in batches.
+
+    A batch is flushed when it reaches ``max_size`` events or when the oldest
+    event in it has waited ``max_latency`` seconds, whichever comes first. Batches
+    are always flushed in the order the events were added.
+    """
+
+    def __init__(
+        self,
+        flush_callback: Callable[[list], None],
+        max_size: int = 100,
+        max_latency: float = 0.25,
+    ) -> None:
+        """Creates an EventBatcher
+
+        Args:
+            flush_callback (Callable[[list], None]): Called with each batch of
+              events.
+            max_size (int, optional): The number of events that triggers a flush.
+              Defaults to 100.
+            max_latency (float, optional): The number of seconds an event can wait
+              before the batch is flushed. Defaults to 0.25.
+
+        Raises:
+            ValueError: Raised when max_size is less than one or max_latency is
+              negative.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if max_latency < 0:
+            raise ValueError("max_latency cannot be negative")
+
+        self.__flush_callback = flush_callback
+        self.__max_size = max_size
+        self.__max_latency = max_latency
+        self.__pending: list = []
+        self.__timer: Union[threading.Timer, None] = None
+        self.__lock = threading.Lock()
+        self.__flush_lock = threading.Lock()
+
+    @property
+    def max_size(self) -> int:
+        """The number of events that triggers a flush."""
+        return self.__max_size
+
+    @property
+    def max_latency(self) -> float:
+        """The longest time in seconds an event waits before being flushed."""
+        return self.__max_latency
+
+    def add(self, event) -> None:
+        """Adds an event to the current batch, flushing it if it is full."""
+        with self.__lock:
+            self.__pending.append(event)
+            full = len(self.__pending) >= self.__max_size
+            if not full and self.__timer is None:
+                self.__timer = threading.Timer(self.__max_latency, self.flush)
+                self.__timer.daemon = True
+                self.__timer.start()
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        """Hands any pending events to the flush callback."""
+        with self.__flush_lock:
+            with self.__lock:
+                batch, self.__pending = self.__pending, []
+                if self.__timer is not None:
+                    self.__timer.cancel()
+                    self.__timer = None
+            if batch:
+                self.__flush_callback(batch)
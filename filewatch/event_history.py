@@ -0,0 +1,109 @@
+from typing import Iterator, List, Union
+
+from .file_event import FileEvent
+
+
+class EventHistory:
+    """Fixed capacity ring buffer of detected events.
+
+    The history keeps the most recent ``capacity`` events. Once full, adding an
+    event overwrites the oldest one so memory use stays constant no matter how long
+    the watcher runs. Events must be appended in increasing sequence number order,
+    which lets readers ask for everything that happened after a sequence number
+    they have already seen.
+
+    Access to the newest event (``history[-1]``) and appending are O(1).
+    """
+
+    def __init__(self, capacity: int = 10000) -> None:
+        """Creates an empty EventHistory
+
+        Args:
+            capacity (int, optional): The maximum number of events retained.
+              Defaults to 10000.
+
+        Raises:
+            ValueError: Raised when capacity is less than one.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.__capacity = capacity
+        self.__buffer: List[Union[FileEvent, None]] = [None] * capacity
+        self.__appended = 0
+        self.__size = 0
+
+    @property
+    def capacity(self) -> int:
+        """The maximum number of events retained by the history."""
+        return self.__capacity
+
+    def append(self, event: FileEvent) -> FileEvent:
+        """Adds an event to the history, overwriting the oldest event when full.
+
+        Args:
+            event (FileEvent): The event being added.
+
+        Returns:
+            FileEvent: The event that was added.
+        """
+        self.__buffer[self.__appended % self.__capacity] = event
+        self.__appended += 1
+        self.__size = min(self.__size + 1, self.__capacity)
+        return event
+
+    def last(self, n: int = 1) -> List[FileEvent]:
+        """Gets the newest n events.
+
+        Args:
+            n (int, optional): Number of events to return. Defaults to 1.
+
+        Returns:
+            List[FileEvent]: Up to n events, ordered oldest to newest.
+        """
+        n = max(0, min(n, self.__size))
+        start = self.__appended - n
+        return [self.__buffer[i % self.__capacity] for i in range(start, start + n)]
+
+    def since(self, sequence: int) -> List[FileEvent]:
+        """Gets the retained events with a sequence number greater than sequence.
+
+        Events that have already been overwritten are not returned. Compare the
+        sequence of the first returned event to detect that events were missed.
+        The cost is proportional to the number of events returned.
+
+        Args:
+            sequence (int): The last sequence number the caller has seen.
+
+        Returns:
+            List[FileEvent]: Matching events, ordered oldest to newest.
+        """
+        count = 0
+        while (
+            count < self.__size
+            and self.__buffer[(self.__appended - 1 - count) % self.__capacity].sequence
+            > sequence
+        ):
+            count += 1
+        return self.last(count)
+
+    def clear(self) -> None:
+        """Removes all events from the history."""
+        self.__buffer = [None] * self.__capacity
+        self.__size = 0
+
+    def __len__(self) -> int:
+        return self.__size
+
+    def __iter__(self) -> Iterator[FileEvent]:
+        return iter(self.last(self.__size))
+
+    def __getitem__(self, index: int) -> FileEvent:
+        if index < 0:
+            index += self.__size
+        if not 0 <= index < self.__size:
+            raise IndexError("history index out of range")
+        oldest = self.__appended - self.__size
+        return self.__buffer[(oldest + index) % self.__capacity]
+
+    def __repr__(self) -> str:
+        return f"EventHistory({self.last(self.__size)!r})"
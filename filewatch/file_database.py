@@ -83,6 +83,25 @@ class FileWatcherDatabase:
         finally:
             conn.close()
 
+    def insert_many(self, rows: list):
+        """
+        Inserts many events into the database in a single transaction.
+        Args:
+            rows (list): Each item is a tuple of (event_time, event_type,
+                event_location, file_type, move_destination) matching the arguments
+                of insert_data.
+        Returns:
+            None
+        """
+        conn = self.create_database_connection()
+        try:
+            with conn:
+                conn.executemany(self.__insert_data_sql(), rows)
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+        finally:
+            conn.close()
+
     def query_by_file_extension(self, ext_param: str) -> list:
         """Query the data base for changes that have to files with a given extension.
 
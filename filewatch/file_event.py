@@ -0,0 +1,153 @@
+import datetime as dt
+import itertools
+import os
+import time
+from typing import Tuple, Union
+
+# Shared by every FileEvent so sequence numbers are unique across handlers.
+# next() on an itertools.count is atomic, so no lock is needed.
+_SEQUENCE = itertools.count()
+
+
+class FileEvent:
+    """Immutable record describing a single file system event.
+
+    Every FileEvent is given a sequence number from a single process wide counter
+    when it is created, so sequence numbers increase in the order events were
+    created and are a stable ordering key for anything downstream.
+
+    Two timestamps are recorded. ``event_time`` is the wall clock time, used for
+    display and storage. ``monotonic_time`` comes from time.monotonic() and should
+    be used to measure the time between events since it never jumps when the
+    system clock is changed.
+
+    For compatibility with observers written against the dictionary events the
+    fields can also be read with subscript notation (e.g. ``event["event_type"]``).
+    """
+
+    __slots__ = (
+        "sequence",
+        "event_type",
+        "event_location",
+        "file_type",
+        "dir_event",
+        "file_destination",
+        "event_time",
+        "monotonic_time",
+    )
+
+    _KEYS = (
+        "event_type",
+        "event_location",
+        "file_destination",
+        "dir_event",
+        "file_type",
+        "event_time",
+    )
+
+    def __init__(
+        self,
+        event_type: str,
+        event_location: str,
+        file_type: Union[str, None] = None,
+        dir_event: bool = False,
+        file_destination: Union[str, None] = None,
+        event_time: Union[dt.datetime, None] = None,
+        monotonic_time: Union[float, None] = None,
+    ) -> None:
+        """Creates a FileEvent
+
+        Args:
+            event_type (str): The type of event (created, deleted, modified, moved)
+            event_location (str): The path where the event occurred.
+            file_type (str, optional): The extension of the file. Defaults to the
+              extension of event_location.
+            dir_event (bool, optional): If the event happened to a directory.
+              Defaults to False.
+            file_destination (str, optional): Where the file was moved to. Only
+              used by moved events. Defaults to None.
+            event_time (dt.datetime, optional): The wall clock time of the event.
+              Defaults to now.
+            monotonic_time (float, optional): The time.monotonic() time of the
+              event. Defaults to now.
+        """
+        if file_type is None:
+            file_type = os.path.splitext(event_location)[1]
+        setter = object.__setattr__
+        setter(self, "sequence", next(_SEQUENCE))
+        setter(self, "event_type", event_type)
+        setter(self, "event_location", event_location)
+        setter(self, "file_type", file_type)
+        setter(self, "dir_event", dir_event)
+        setter(self, "file_destination", file_destination)
+        setter(self, "event_time", event_time or dt.datetime.now())
+        setter(
+            self,
+            "monotonic_time",
+            time.monotonic() if monotonic_time is None else monotonic_time,
+        )
+
+    def replace(self, **changes) -> "FileEvent":
+        """Creates a copy of the event with some fields changed.
+
+        The copy is given a new sequence number.
+
+        Args:
+            **changes: Any of the arguments accepted by FileEvent.
+
+        Returns:
+            FileEvent: The new event.
+        """
+        fields = {
+            "event_type": self.event_type,
+            "event_location": self.event_location,
+            "file_type": self.file_type,
+            "dir_event": self.dir_event,
+            "file_destination": self.file_destination,
+            "event_time": self.event_time,
+            "monotonic_time": self.monotonic_time,
+        }
+        fields.update(changes)
+        return FileEvent(**fields)
+
+    def to_row(self) -> Tuple[float, str, str, str, Union[str, None]]:
+        """Returns the event in the column order used by FileWatcherDatabase.
+
+        Returns:
+            tuple: (event_time, event_type, event_location, file_type,
+              move_destination) with event_time as epoch seconds.
+        """
+        return (
+            self.event_time.timestamp(),
+            self.event_type,
+            self.event_location,
+            self.file_type,
+            self.file_destination,
+        )
+
+    def keys(self) -> Tuple[str, ...]:
+        """Returns the names of the fields readable with subscript notation."""
+        return tuple(key for key in self._KEYS if getattr(self, key) is not None)
+
+    def get(self, key: str, default=None):
+        """Gets a field by name, returning default when the field is not set."""
+        value = getattr(self, key, None) if key in self._KEYS else None
+        return default if value is None else value
+
+    def __getitem__(self, key: str):
+        if key not in self._KEYS or getattr(self, key) is None:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._KEYS and getattr(self, key) is not None
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FileEvent is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("FileEvent is immutable")
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{key}={getattr(self, key)!r}" for key in self.keys())
+        return f"FileEvent(sequence={self.sequence}, {fields})"
@@ -1,6 +1,3 @@
-import datetime
-import os
-import datetime as dt
 from watchdog.events import (
     DirCreatedEvent,
     DirDeletedEvent,
@@ -15,6 +12,12 @@ from watchdog.events import (
 
 from typing import Union, List
 
+from .coalesce import EventCoalescer
+from .dispatch import AsyncDispatcher, EventBatcher, ObserverDispatcher
+from .event_history import EventHistory
+from .file_event import FileEvent
+from .path_filter import PathFilter
+
 
 class FileHandler(FileSystemEventHandler):
     """Detects and reports on changes to files.
@@ -29,24 +32,86 @@ class FileHandler(FileSystemEventHandler):
     happens and "modified" event for the directory triggers. FileHandler eliminates
     the redundant directory level events and only return the event that best
     defines the event. When a file is created only the "created" event is recorded
-    by FileHandler.
+    by FileHandler. Events for each path are held for a short settle window and
+    merged by an EventCoalescer before they are recorded.
 
 
     References:
     Watchdog https://python-watchdog.readthedocs.io/en/stable/api.html#watchdog.events.FileSystemEvent
     """
 
-    def __init__(self) -> None:
-        """Creates an instance of the FileHandler"""
+    def __init__(
+        self,
+        history_capacity: int = 10000,
+        dispatch_mode: str = "sync",
+        dispatch_workers: int = 1,
+        dispatch_queue_size: int = 1000,
+        overflow_policy: str = "block",
+        batch_size: int = 100,
+        batch_window: float = 0.25,
+        settle_window: float = 0.5,
+        path_filter: Union[PathFilter, None] = None,
+    ) -> None:
+        """Creates an instance of the FileHandler
+
+        Args:
+            history_capacity (int, optional): The number of events kept in the
+              event history. Once the history is full the oldest events are
+              discarded. Defaults to 10000.
+            dispatch_mode (str, optional): How registered observers are notified.
+              "sync" notifies observers on the thread that detected the event.
+              "async" queues the event and notifies observers from worker threads
+              so detection is not blocked by slow observers. Defaults to "sync".
+            dispatch_workers (int, optional): Number of worker threads used by the
+              "async" dispatch mode. Defaults to 1.
+            dispatch_queue_size (int, optional): Maximum number of events waiting
+              for each worker in the "async" dispatch mode. Defaults to 1000.
+            overflow_policy (str, optional): What the "async" dispatch mode does
+              when a worker's queue is full: "block", "drop-oldest",
+              "drop-modifies-first" or "coalesce". See EventQueue. Defaults to
+              "block".
+            batch_size (int, optional): The number of events that are delivered
+              together to observers implementing notify_batch. Defaults to 100.
+            batch_window (float, optional): The longest time in seconds an event
+              waits for its batch to fill before being delivered to observers
+              implementing notify_batch. Defaults to 0.25.
+            settle_window (float, optional): The number of seconds events for a
+              path are held so related events can be merged into one. Defaults to
+              0.5.
+            path_filter (PathFilter, optional): Decides which paths events are
+              reported for. Defaults to a PathFilter watching every extension and
+              ignoring .DS_Store files.
+
+        Raises:
+            ValueError: Raised when dispatch_mode is not "sync" or "async", or the
+              overflow_policy is not known.
+        """
         super().__init__()
 
-        self.__current_event: Union[dict, None] = None
+        if dispatch_mode == "sync":
+            self.__dispatcher = ObserverDispatcher()
+        elif dispatch_mode == "async":
+            self.__dispatcher = AsyncDispatcher(
+                dispatch_workers, dispatch_queue_size, overflow_policy
+            )
+        else:
+            raise ValueError(f"Unknown dispatch mode: {dispatch_mode}")
+        self.__dispatch_mode = dispatch_mode
+        self.__batcher = EventBatcher(self._notify_batch, batch_size, batch_window)
+        self.__coalescer = EventCoalescer(self._emit, settle_window)
+
+        self.__current_event: Union[FileEvent, None] = None
         self.__watched_extension: list = []
-        self.__event_history = []
+        self.__path_filter = path_filter if path_filter is not None else PathFilter()
+        if self.__path_filter.extensions:
+            self.__watched_extension = sorted(self.__path_filter.extensions)
+        self.__event_history = EventHistory(history_capacity)
         self.__registered_observers = []
+        self.__event_observers: tuple = ()
+        self.__batch_observers: tuple = ()
 
     @property
-    def current_event(self) -> Union[dict, None]:
+    def current_event(self) -> Union[FileEvent, None]:
         """Gets the most recently detected file system event
 
         When an event is detected the following information is recorded.
@@ -56,22 +121,26 @@ class FileHandler(FileSystemEventHandler):
         3. Event Time (as a string)
         4. If it is a directory event (boolean)
         5. File Destination (Only if a move event)
+        6. Sequence number and monotonic clock time
 
         Returns:
-            Union[dict, None]: If an event has occurred a dictionary with
+            Union[FileEvent, None]: If an event has occurred a FileEvent with
               information about the event are returned. None is returned if no
               events have been detected.
         """
         return self.__current_event
 
     @property
-    def event_history(self) -> List[Union[dict, None]]:
-        """Gets the record of all the events that have occurred.
+    def event_history(self) -> EventHistory:
+        """Gets the record of the most recent events that have occurred.
+
+        The history is bounded. Only the newest ``history_capacity`` events are
+        kept.
 
         Returns:
-            List[Union[dict, None]]: Each item in the list is a dictionary
-              containing information about all detected events. If no events have
-              been detected the list will be empty.
+            EventHistory: Ring buffer of FileEvents containing information about
+              the detected events. If no events have been detected the history will
+              be empty.
 
         See Also:
           :func: ` current_event <file_watch.FileHandler.current_event>`
@@ -79,6 +148,28 @@ class FileHandler(FileSystemEventHandler):
 
         return self.__event_history
 
+    def recent_events(self, n: int = 1) -> List[FileEvent]:
+        """Gets the newest n events from the event history.
+
+        Args:
+            n (int, optional): The number of events to return. Defaults to 1.
+
+        Returns:
+            List[FileEvent]: Up to n events ordered from oldest to newest.
+        """
+        return self.__event_history.last(n)
+
+    def events_since(self, sequence: int) -> List[FileEvent]:
+        """Gets the events added to the history after the given sequence number.
+
+        Args:
+            sequence (int): The sequence number of the last event already seen.
+
+        Returns:
+            List[FileEvent]: The retained events ordered from oldest to newest.
+        """
+        return self.__event_history.since(sequence)
+
     @property
     def watched_extension(self) -> List[str]:
         """The get or set the file extensions that FileWatcher should monitor.
@@ -93,11 +184,48 @@ class FileHandler(FileSystemEventHandler):
     @watched_extension.setter
     def watched_extension(self, value: list):
         self.__watched_extension = value
+        self.__path_filter = self.__path_filter.replace(extensions=value)
+
+    @property
+    def path_filter(self) -> PathFilter:
+        """The get or set the PathFilter deciding which paths events are reported for.
+
+        Setting the filter also sets watched_extension to the filter's extensions.
+
+        Returns:
+            PathFilter: The filter applied to every event.
+        """
+        return self.__path_filter
+
+    @path_filter.setter
+    def path_filter(self, value: PathFilter):
+        self.__path_filter = value
+        self.__watched_extension = sorted(value.extensions)
 
     @property
     def registered_observers(self):
         return self.__registered_observers
 
+    @property
+    def dispatch_mode(self) -> str:
+        """Gets how observers are notified of events ("sync" or "async")."""
+        return self.__dispatch_mode
+
+    def pipeline_stats(self) -> dict:
+        """Gets counters describing the delivery of events to observers.
+
+        Returns:
+            dict: "pending" is the number of deliveries waiting in the dispatch
+              queues, "dropped" the number discarded by the overflow policy and
+              "coalesced" the number merged into an already queued delivery. All
+              are zero in the "sync" dispatch mode.
+        """
+        return {
+            "pending": self.__dispatcher.pending,
+            "dropped": self.__dispatcher.dropped,
+            "coalesced": self.__dispatcher.coalesced,
+        }
+
     def on_created(self, event: Union[DirCreatedEvent, FileCreatedEvent]) -> None:
         """Watches for the creation of a file or directory.
 
@@ -106,21 +234,10 @@ class FileHandler(FileSystemEventHandler):
             representing the creation of a file or directory.
             See https://python-watchdog.readthedocs.io/en/stable/api.html#watchdog.events.FileSystemEvent
         """
-        print(event)
-        if event.event_type == "created":
-            file_type = os.path.splitext(event.src_path)
-            if file_type[1] in self.__watched_extension or not self.__watched_extension:
-                temp = {
-                    "event_type": event.event_type,
-                    "event_location": event.src_path,
-                    "dir_event": event.is_directory,
-                    "file_type": file_type[1],
-                    "event_time": dt.datetime.now(),
-                }
-                # TODO: refactor this to take an event not the dict.
-                to_notify = self._reconcile_created_events(temp)
-                if to_notify:
-                    self.notify()
+        if event.event_type == "created" and self.__path_filter.matches(
+            event.src_path, event.is_directory
+        ):
+            self._event_actions(event)
 
     def on_moved(self, event: Union[DirMovedEvent, FileMovedEvent]) -> None:
         """Watches for file or directory being moved.
@@ -130,13 +247,11 @@ class FileHandler(FileSystemEventHandler):
             representing the moving of a file or directory.
             See https://python-watchdog.readthedocs.io/en/stable/api.html#watchdog.events.FileSystemEvent
         """
-        # With a modified event present we get a bunch of extra event calls. We
-        # Need to filter to just the created event!
-        if event.event_type == "moved":
-            file_type = os.path.splitext(event.src_path)
-            if file_type[1] in self.__watched_extension or not self.__watched_extension:
-                self._event_actions(event)
-                self.notify()
+        if event.event_type == "moved" and (
+            self.__path_filter.matches(event.src_path, event.is_directory)
+            or self.__path_filter.matches(event.dest_path, event.is_directory)
+        ):
+            self._event_actions(event)
 
     def on_deleted(self, event: Union[DirDeletedEvent, FileDeletedEvent]) -> None:
         """Watches for file or directory being deleted.
@@ -146,10 +261,8 @@ class FileHandler(FileSystemEventHandler):
             representing the moving of a file or directory.
             See https://python-watchdog.readthedocs.io/en/stable/api.html#watchdog.events.FileSystemEvent
         """
-        file_type = os.path.splitext(event.src_path)
-        if file_type[1] in self.__watched_extension or not self.__watched_extension:
+        if self.__path_filter.matches(event.src_path, event.is_directory):
             self._event_actions(event)
-            self.notify()
 
     def on_modified(self, event: Union[DirModifiedEvent, FileModifiedEvent]) -> None:
         """Watches for file or directory being modified.
@@ -159,142 +272,71 @@ class FileHandler(FileSystemEventHandler):
             representing the moving of a file or directory.
             See https://python-watchdog.readthedocs.io/en/stable/api.html#watchdog.events.FileSystemEvent
         """
-        file_type = os.path.splitext(event.src_path)
-
-        if (
-            file_type[1] in self.__watched_extension
-            or not self.__watched_extension
-            and not event.src_path.endswith(".DS_Store")
-        ):
-            temp = {
-                "event_type": event.event_type,
-                "event_location": event.src_path,
-                "dir_event": event.is_directory,
-                "file_type": file_type[1],
-                "event_time": dt.datetime.now(),
-            }
-            to_notify = self._reconcile_modified_events(temp)
-            if to_notify:
-                self.notify()
-
-    def _reconcile_modified_events(self, temp: dict):
-        """Determines if a modified event was triggered by another event
-
-        When files are created, deleted or moved, a modified event for the directory also
-        fires. The modified event fires after the file event. The since the modified
-        events are redundant we filter them out.
-
-        The redundant events are filtered out if the the previous event in the event history
-        is a created, deleted or moved event, the current event is a modified event
-
-        Args:
-            temp (dict): _description_
-        """
-        # TODO: Refactor this so _reconcile_modified event takes the event as argument.
-        if self.__event_history:
-            previous_event = self.__event_history[-1]
-            if (
-                previous_event["event_type"] == "created"
-                or previous_event["event_type"] == "deleted"
-                or previous_event["event_type"] == "moved"
-                or (previous_event["event_type"] == "modified" and temp["dir_event"])
-            ) and (temp["event_time"] - previous_event["event_time"]) < dt.timedelta(
-                milliseconds=500
-            ):
-                return False
-            else:
-                self.__event_history.append(temp)
-                self.__current_event = temp
-                return True
-        else:
-            self.__event_history.append(temp)
-            self.__current_event = temp
-            return True
-
-    def _reconcile_created_events(self, temp):
-        """Determines if a created event was triggered by another event
+        if self.__path_filter.matches(event.src_path, event.is_directory):
+            self._event_actions(event)
 
-        When a directory is created, a modified event for the parent directory also
-        fires. The modified event fires before the created event. The since the modified
-        events are redundant we filter them out.
+    def _event_actions(self, event):
+        """Internal method for processing event information
 
-        The redundant events are filtered out if the the previous event in the event history
-        is a created, deleted or moved event, the current event is a modified event
+        Creates a FileEvent with the event information and passes it to the
+        coalescer. The coalescer merges it with other events for the same path and
+        emits the result once the settle window closes.
 
         Args:
-            temp (dict): _description_
+            event (): event from one of the "on" methods.
+
         """
-        if self.__event_history:
-            previous_event = self.__event_history[-1]
-            if (
-                previous_event["event_type"] == "modified"
-                and previous_event["dir_event"]
-                and (temp["event_time"] - previous_event["event_time"])
-                < dt.timedelta(milliseconds=500)
-            ):
-                self.__event_history.pop()
-                self.__event_history.append(temp)
-                self.__current_event = temp
-                return True
-            elif previous_event["event_type"] == "created":
-                self.__event_history.append(temp)
-                self.__current_event = temp
-                return True
-            else:
-                return False
-        else:
-            self.__event_history.append(temp)
-            self.__current_event = temp
-            return True
+        record = FileEvent(
+            event.event_type,
+            event.src_path,
+            dir_event=event.is_directory,
+            file_destination=event.dest_path if event.event_type == "moved" else None,
+        )
 
-    def _event_actions(self, event):
-        """Internal method for processing event information
+        self.__coalescer.add(record)
+        return record
 
-        Creates a dictionary with the event information. Adds it to the event
-        history and sets it as the current event
+    def _emit(self, record: FileEvent) -> None:
+        """Records a coalesced event and notifies the observers.
 
-        Args:
-            event (): event from one of the "on" methods.
+        Adds the event to the event history and sets it as the current event.
+        Merging can emit an event created before the last event that was emitted.
+        Such events are renumbered so sequence numbers always increase in the
+        order observers see them.
 
+        Args:
+            record (FileEvent): The event emitted by the coalescer.
         """
-        if event.event_type == "moved":
-            self.__current_event = {
-                "event_type": event.event_type,
-                "event_location": event.src_path,
-                "file_destination": event.dest_path,
-                "file_type": os.path.splitext(event.src_path)[1],
-                "dir_event": event.is_directory,
-                "event_time": datetime.datetime.now(),
-            }
-        else:
-            self.__current_event = {
-                "event_type": event.event_type,
-                "event_location": event.src_path,
-                "file_type": os.path.splitext(event.src_path)[1],
-                "event_time": datetime.datetime.now(),
-            }
-
-        self.__event_history.append(self.__current_event)
-        return self.__current_event
+        current = self.__current_event
+        if current is not None and record.sequence < current.sequence:
+            record = record.replace()
+        self.__current_event = self.__event_history.append(record)
+        self.notify()
 
     def register_observers(self, observer):
         """Registers observers that want to be notified about file changes.
 
-        Registered observers need to implement a notify method.
+        Registered observers need to implement a notify method, a notify_batch
+        method or both. Observers with a notify_batch method receive lists of events
+        once batch_size events have accumulated or batch_window seconds have passed.
+        Observers with only a notify method are notified of each event as it
+        happens.
 
         Args:
             observer: A object that wants to be notified about a file event.
-              Object must have a notify method.
+              Object must have a notify or notify_batch method.
 
         Raises:
             AttributeError: Error occurs when the provided object does not have a
-              notify method.
+              notify or notify_batch method.
         """
-        if not hasattr(observer, "notify"):
+        if not hasattr(observer, "notify") and not hasattr(observer, "notify_batch"):
             raise AttributeError(
                 "Notify Method Is Not Implemented. Cannot register observer"
             )
         self.__registered_observers.append(observer)
+        self.__dispatcher.assign(observer)
+        self.__split_observers()
 
     def deregister_observers(self, observer):
         """Removes an observer from the list of observers to be notified when an event
@@ -305,9 +347,50 @@ class FileHandler(FileSystemEventHandler):
               registered observers.
         """
         self.__registered_observers.remove(observer)
+        self.__dispatcher.release(observer)
+        self.__split_observers()
+
+    def __split_observers(self) -> None:
+        """Separates the observers that take batches from those that do not."""
+        self.__batch_observers = tuple(
+            o for o in self.__registered_observers if hasattr(o, "notify_batch")
+        )
+        self.__event_observers = tuple(
+            o for o in self.__registered_observers if not hasattr(o, "notify_batch")
+        )
 
     def notify(self) -> None:
-        """Notify all the observers of an event change."""
+        """Notify all the observers of an event change.
 
-        for observer in self.__registered_observers:
-            observer.notify(self.current_event)
+        In the "async" dispatch mode the event is queued and this method returns
+        before the observers have been notified. Observers implementing
+        notify_batch are notified when the current batch is flushed.
+        """
+        if self.__event_observers:
+            self.__dispatcher.dispatch(self.current_event, self.__event_observers)
+        if self.__batch_observers:
+            self.__batcher.add(self.current_event)
+
+    def _notify_batch(self, events: list) -> None:
+        """Delivers a batch of events to the observers implementing notify_batch."""
+        if self.__batch_observers:
+            self.__dispatcher.dispatch_batch(events, self.__batch_observers)
+
+    def flush(self) -> None:
+        """Waits until all observers have been notified of the detected events.
+
+        Events waiting in the settle window are emitted and any partially filled
+        batch is delivered immediately.
+        """
+        self.__coalescer.flush()
+        self.__batcher.flush()
+        self.__dispatcher.flush()
+
+    def close(self) -> None:
+        """Notifies observers of any outstanding events and stops the dispatcher.
+
+        The handler should not be used after it is closed.
+        """
+        self.__coalescer.close()
+        self.__batcher.flush()
+        self.__dispatcher.close()
@@ -0,0 +1,167 @@
+import fnmatch
+import functools
+import os
+import re
+from typing import Iterable, Union
+
+DEFAULT_IGNORED_NAMES = (".DS_Store",)
+COMMON_IGNORED_DIRECTORIES = (".git", "node_modules", "__pycache__")
+
+
+class PathFilter:
+    """Decides which paths the FileHandler reports events for.
+
+    A path passes the filter when all of the following are true:
+
+    1. Its extension is one of ``extensions`` (or no extensions were given).
+    2. It matches one of the ``include`` glob patterns (or none were given).
+    3. It does not match any of the ``exclude`` glob patterns.
+    4. None of its directories are named in ``ignore_dirs``.
+    5. Its file name is not one of ``ignore_names``.
+
+    Glob patterns are matched against both the full path and the file name, so
+    ``*.py`` and ``*/build/*`` both work. All the patterns are compiled into a single
+    regular expression when the filter is created.
+
+    Decisions are cached per path in an LRU cache, since the same files tend to
+    generate events over and over. A PathFilter is immutable. Use ``replace`` to
+    make a filter with different settings.
+    """
+
+    def __init__(
+        self,
+        extensions: Iterable[str] = (),
+        include: Iterable[str] = (),
+        exclude: Iterable[str] = (),
+        ignore_dirs: Iterable[str] = (),
+        ignore_names: Iterable[str] = DEFAULT_IGNORED_NAMES,
+        cache_size: int = 65536,
+    ) -> None:
+        """Creates a PathFilter
+
+        Args:
+            extensions (Iterable[str], optional): File extensions to watch,
+              including the leading dot (e.g. ".txt"). Defaults to all extensions.
+            include (Iterable[str], optional): Glob patterns a path must match.
+              Defaults to every path.
+            exclude (Iterable[str], optional): Glob patterns of paths to ignore.
+              Defaults to no patterns.
+            ignore_dirs (Iterable[str], optional): Directory names whose contents
+              are ignored, e.g. ".git" or "node_modules/". Defaults to none. See
+              COMMON_IGNORED_DIRECTORIES for a useful starting point.
+            ignore_names (Iterable[str], optional): File names that are always
+              ignored. Defaults to DEFAULT_IGNORED_NAMES (".DS_Store").
+            cache_size (int, optional): The number of decisions kept in the LRU
+              cache. Defaults to 65536.
+        """
+        self.__extensions = frozenset(extensions)
+        self.__include = tuple(include)
+        self.__exclude = tuple(exclude)
+        self.__ignore_dirs = frozenset(d.rstrip("/\\") for d in ignore_dirs)
+        self.__ignore_names = frozenset(ignore_names)
+        self.__cache_size = cache_size
+        self.__include_re = self._compile(self.__include)
+        self.__exclude_re = self._compile(self.__exclude)
+        self.__decide = functools.lru_cache(maxsize=cache_size)(self._evaluate)
+
+    @property
+    def extensions(self) -> frozenset:
+        """The watched file extensions. Empty when all extensions are watched."""
+        return self.__extensions
+
+    @property
+    def include(self) -> tuple:
+        """Glob patterns a path must match."""
+        return self.__include
+
+    @property
+    def exclude(self) -> tuple:
+        """Glob patterns of paths that are ignored."""
+        return self.__exclude
+
+    @property
+    def ignore_dirs(self) -> frozenset:
+        """Directory names whose contents are ignored."""
+        return self.__ignore_dirs
+
+    @property
+    def ignore_names(self) -> frozenset:
+        """File names that are always ignored."""
+        return self.__ignore_names
+
+    def replace(self, **changes) -> "PathFilter":
+        """Creates a new PathFilter with some settings changed.
+
+        Args:
+            **changes: Any of the arguments accepted by PathFilter.
+
+        Returns:
+            PathFilter: The new filter. Its cache starts empty.
+        """
+        settings = {
+            "extensions": self.__extensions,
+            "include": self.__include,
+            "exclude": self.__exclude,
+            "ignore_dirs": self.__ignore_dirs,
+            "ignore_names": self.__ignore_names,
+            "cache_size": self.__cache_size,
+        }
+        settings.update(changes)
+        return PathFilter(**settings)
+
+    def matches(self, path: str, is_directory: bool = False) -> bool:
+        """Checks if events for a path should be reported.
+
+        Args:
+            path (str): The path of the file or directory.
+            is_directory (bool, optional): If the path is a directory. Defaults to
+              False.
+
+        Returns:
+            bool: True if the path passes the filter.
+        """
+        return self.__decide(path, is_directory)
+
+    def cache_info(self):
+        """Returns the hit and miss statistics of the decision cache."""
+        return self.__decide.cache_info()
+
+    def _evaluate(self, path: str, is_directory: bool) -> bool:
+        """Makes the uncached decision for matches."""
+        if self.__extensions and os.path.splitext(path)[1] not in self.__extensions:
+            return False
+
+        normalized = path.replace("\\", "/")
+        parts = normalized.split("/")
+        name = parts[-1]
+        if name in self.__ignore_names:
+            return False
+        if self.__ignore_dirs:
+            directories = parts if is_directory else parts[:-1]
+            if not self.__ignore_dirs.isdisjoint(directories):
+                return False
+
+        if self.__exclude_re is not None and (
+            self.__exclude_re.match(normalized) or self.__exclude_re.match(name)
+        ):
+            return False
+        if self.__include_re is not None and not (
+            self.__include_re.match(normalized) or self.__include_re.match(name)
+        ):
+            return False
+        return True
+
+    @staticmethod
+    def _compile(patterns: tuple) -> Union[re.Pattern, None]:
+        """Compiles glob patterns into a single regular expression."""
+        if not patterns:
+            return None
+        return re.compile("|".join(fnmatch.translate(p) for p in patterns))
+
+    def __repr__(self) -> str:
+        return (
+            f"PathFilter(extensions={sorted(self.__extensions)!r}, "
+            f"include={self.__include!r}, exclude={self.__exclude!r}, "
+            f"ignore_dirs={sorted(self.__ignore_dirs)!r}, "
+            f"ignore_names={sorted(self.__ignore_names)!r})"
+        )
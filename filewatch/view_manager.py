@@ -7,6 +7,7 @@ from .file_database import FileWatcherDatabase
 from .watcher import FileWatcher
 from .watcher_gui import WatcherGUI
 from .file_watch import FileHandler
+from .file_event import FileEvent
 
 from fileinput import filename
 
@@ -113,47 +114,37 @@ class ViewManager:
                 (row[0], row[1], dt.datetime.fromtimestamp(row[2]), row[3], row[4])
             )
 
-    def notify(self, current_event: dict):
+    def notify(self, current_event: FileEvent):
         """Handles notifications from the FileWatcher by updating GUI log panel w event
         and inserts event into DB
 
         Args:
-            event_type (str): Type of event (created, modified, etc.)
-            filename (str): Name of edited file
-            directory (str): Directory where event occurred
-            timestamp (float): Timestamp of when event occured
-
+            current_event (FileEvent): The event detected by the FileHandler.
         """
-        keys = current_event.keys()
-        location = current_event["event_location"] if "event_location" in keys else None
-        event_type = current_event["event_type"] if "event_type" in keys else None
-        event_time_str = (
-            current_event["event_time"].strftime("%Y-%m-%d %H:%M:%S")
-            if "event_time" in keys
-            else None
-        )
-        event_time_int = (
-            current_event["event_time"].timestamp() if "event_time" in keys else None
-        )
-        file_type = current_event["file_type"] if "file_type" in keys else None
-        move_destination = (
-            current_event["file_destination"] if "file_destination" in keys else None
-        )
+        self.notify_batch([current_event])
+
+    def notify_batch(self, events: list):
+        """Handles batched notifications from the FileWatcher.
 
-        # Send to GUI
-        self.__view.insert_change_records(
-            (
-                location,
-                event_type,
-                event_time_str,
-                file_type,
-                move_destination,
+        Every event in the batch is added to the GUI log panel and the whole batch
+        is inserted into the DB in a single transaction.
+
+        Args:
+            events (list): The FileEvents detected by the FileHandler, oldest first.
+        """
+        for event in events:
+            # Send to GUI
+            self.__view.insert_change_records(
+                (
+                    event.event_location,
+                    event.event_type,
+                    event.event_time.strftime("%Y-%m-%d %H:%M:%S"),
+                    event.file_type,
+                    event.file_destination,
+                )
             )
-        )
 
-        self.__db.insert_data(
-            event_time_int, event_type, location, file_type, move_destination
-        )
+        self.__db.insert_many([event.to_row() for event in events])
 
     def generate_report(self):
         """Manages the generation of file activity report
@@ -62,8 +62,13 @@ class FileWatcher:
         self.__observer.start()
 
     def stop_watching(self):
-        """Stops watching for file changes"""
-        print("Stopped Watching")
+        """Stops watching for file changes
 
+        Waits for the registered observers to be notified of the events that were
+        detected before the watcher stopped.
+        """
         self.__observer.stop()
         self.__observer.join()
+        self.__handler.flush()
+
+        print("Stopped Watching")
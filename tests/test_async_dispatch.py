@@ -0,0 +1,148 @@
+import os
+import threading
+import time
+import pytest
+from watchdog.events import FileCreatedEvent, FileModifiedEvent
+from filewatch.dispatch import AsyncDispatcher, EventQueue
+from filewatch.file_event import FileEvent
+from filewatch.file_watch import FileHandler
+from filewatch.watcher import FileWatcher
+
+
+class RecordingObserver:
+    def __init__(self, delay: float = 0) -> None:
+        self.delay = delay
+        self.events = []
+        self.threads = set()
+
+    def notify(self, current_event):
+        time.sleep(self.delay)
+        self.threads.add(threading.current_thread().name)
+        self.events.append(current_event)
+
+
+def test_dispatch_does_not_block_on_slow_observer():
+    """Test that dispatching returns before a slow observer is done."""
+    dispatcher = AsyncDispatcher(workers=1, queue_size=10)
+    slow = RecordingObserver(delay=0.1)
+
+    start = time.perf_counter()
+    for i in range(5):
+        dispatcher.dispatch(i, [slow])
+    elapsed = time.perf_counter() - start
+    dispatcher.close()
+
+    assert elapsed < 0.1
+    assert slow.events == [0, 1, 2, 3, 4]
+
+
+def test_per_observer_ordering_with_many_workers():
+    """Test that each observer receives events in order from a single worker."""
+    dispatcher = AsyncDispatcher(workers=3, queue_size=5)
+    observers = [RecordingObserver() for _ in range(4)]
+    for observer in observers:
+        dispatcher.assign(observer)
+
+    for i in range(200):
+        dispatcher.dispatch(i, observers)
+    dispatcher.flush()
+    dispatcher.close()
+
+    for observer in observers:
+        assert observer.events == list(range(200))
+        assert len(observer.threads) == 1
+
+
+def test_invalid_dispatch_mode():
+    with pytest.raises(ValueError):
+        FileHandler(dispatch_mode="fast")
+
+
+def test_async_handler_notifies_observers(single_level_dir):
+    """Test that observers of an async handler are notified of detected events."""
+    observer = RecordingObserver()
+    handler = FileHandler(dispatch_mode="async", dispatch_workers=2)
+    handler.register_observers(observer)
+    fname = os.path.abspath("./tests/rootdir/test_0.ext")
+    watcher = FileWatcher(handler)
+    watcher.start_watching("./tests/rootdir")
+
+    os.remove(fname)
+    time.sleep(1.5)
+    watcher.stop_watching()
+    handler.close()
+
+    assert len(observer.events) == 1
+    assert observer.events[0]["event_type"] == "deleted"
+
+
+def modified(path):
+    return (FileEvent("modified", path), ["observer"], False)
+
+
+def created(path):
+    return (FileEvent("created", path), ["observer"], False)
+
+
+def test_queue_drop_oldest():
+    q = EventQueue(2, "drop-oldest")
+    for item in (created("./a"), created("./b"), created("./c")):
+        q.put(item)
+
+    assert q.dropped == 1
+    assert q.get()[0].event_location == "./b"
+
+
+def test_queue_drop_modifies_first():
+    """Test that modified events are dropped before any other events."""
+    q = EventQueue(2, "drop-modifies-first")
+    q.put(created("./a"))
+    q.put(modified("./b"))
+    q.put(created("./c"))
+    q.put(modified("./d"))
+
+    assert q.dropped == 2
+    assert [q.get()[0].event_location for _ in range(2)] == ["./a", "./c"]
+
+
+def test_queue_coalesce():
+    q = EventQueue(1, "coalesce")
+    q.put(modified("./a"))
+    q.put(modified("./a"))
+
+    assert q.coalesced == 1
+    assert q.qsize() == 1
+
+
+def test_handler_reports_pipeline_stats():
+    """Test that a burst against a stalled observer drops modifies, not creates."""
+    release = threading.Event()
+
+    class StalledObserver:
+        def __init__(self) -> None:
+            self.events = []
+
+        def notify(self, current_event):
+            release.wait()
+            self.events.append(current_event)
+
+    observer = StalledObserver()
+    handler = FileHandler(
+        dispatch_mode="async",
+        dispatch_queue_size=2,
+        overflow_policy="drop-modifies-first",
+        settle_window=0,
+    )
+    handler.register_observers(observer)
+    handler.dispatch(FileCreatedEvent("./root/first.txt"))
+    time.sleep(0.2)
+    for i in range(5):
+        handler.dispatch(FileModifiedEvent(f"./root/file_{i}.txt"))
+    time.sleep(0.2)
+    stats = handler.pipeline_stats()
+    release.set()
+    handler.close()
+
+    assert stats["dropped"] == 3
+    assert observer.events[0]["event_type"] == "created"
+    assert len(observer.events) == 3
@@ -0,0 +1,72 @@
+import time
+from watchdog.events import FileDeletedEvent
+from filewatch.dispatch import EventBatcher
+from filewatch.file_database import FileWatcherDatabase
+from filewatch.file_watch import FileHandler
+
+
+class MockBatchObserver:
+    def __init__(self) -> None:
+        self.batches = []
+
+    def notify_batch(self, events):
+        self.batches.append(list(events))
+
+
+class MockObserveIncrement:
+    def __init__(self) -> None:
+        self.n_calls = 0
+
+    def notify(self, current_event):
+        self.n_calls += 1
+
+
+def test_batcher_flushes_by_size():
+    batches = []
+    batcher = EventBatcher(batches.append, max_size=3, max_latency=10)
+    for i in range(7):
+        batcher.add(i)
+
+    assert batches == [[0, 1, 2], [3, 4, 5]]
+    batcher.flush()
+    assert batches[-1] == [6]
+
+
+def test_batcher_flushes_by_time():
+    batches = []
+    batcher = EventBatcher(batches.append, max_size=100, max_latency=0.05)
+    batcher.add("a")
+    batcher.add("b")
+    time.sleep(0.2)
+
+    assert batches == [["a", "b"]]
+
+
+def test_batch_and_single_observers():
+    """Test that batch observers get batches and other observers get every event."""
+    batch = MockBatchObserver()
+    single = MockObserveIncrement()
+    handler = FileHandler(batch_size=2, batch_window=10)
+    handler.register_observers(batch)
+    handler.register_observers(single)
+
+    for i in range(5):
+        handler.dispatch(FileDeletedEvent(f"./tests/file_{i}.txt"))
+    handler.flush()
+
+    assert single.n_calls == 5
+    assert [len(b) for b in batch.batches] == [2, 2, 1]
+    assert batch.batches[0][0]["event_location"] == "./tests/file_0.txt"
+
+
+def test_insert_many(tmp_path):
+    db = FileWatcherDatabase(tmp_path)
+    db.create_table()
+    db.insert_many(
+        [
+            (1.0, "created", "/path/a.txt", ".txt", None),
+            (2.0, "moved", "/path/a.txt", ".txt", "/path/b.txt"),
+        ]
+    )
+
+    assert len(db.query_by_file_extension(".txt")) == 2
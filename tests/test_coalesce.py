@@ -0,0 +1,77 @@
+import time
+from watchdog.events import (
+    DirCreatedEvent,
+    DirModifiedEvent,
+    FileCreatedEvent,
+    FileDeletedEvent,
+    FileModifiedEvent,
+    FileMovedEvent,
+)
+from filewatch.file_watch import FileHandler
+
+
+def test_interleaved_modifies_are_coalesced():
+    """Test that repeated modifies of interleaved files produce one event per file."""
+    handler = FileHandler(settle_window=10)
+    for _ in range(5):
+        handler.dispatch(FileModifiedEvent("./root/a.txt"))
+        handler.dispatch(FileModifiedEvent("./root/b.txt"))
+        handler.dispatch(DirModifiedEvent("./root"))
+    handler.flush()
+
+    assert [e["event_location"] for e in handler.event_history] == [
+        "./root/a.txt",
+        "./root/b.txt",
+    ]
+
+
+def test_create_then_modify_is_created():
+    handler = FileHandler(settle_window=10)
+    handler.dispatch(DirModifiedEvent("./root"))
+    handler.dispatch(FileCreatedEvent("./root/a.txt"))
+    handler.dispatch(FileModifiedEvent("./root/a.txt"))
+    handler.dispatch(DirModifiedEvent("./root"))
+    handler.flush()
+
+    assert len(handler.event_history) == 1
+    assert handler.current_event["event_type"] == "created"
+
+
+def test_temporary_file_is_dropped():
+    """Test that a file created and deleted within the window is not reported."""
+    handler = FileHandler(settle_window=10)
+    handler.dispatch(FileCreatedEvent("./root/a.tmp"))
+    handler.dispatch(FileModifiedEvent("./root/a.tmp"))
+    handler.dispatch(FileDeletedEvent("./root/a.tmp"))
+    handler.flush()
+
+    assert not handler.event_history
+
+
+def test_created_then_moved_is_created_at_destination():
+    handler = FileHandler(settle_window=10)
+    handler.dispatch(FileCreatedEvent("./root/a.tmp"))
+    handler.dispatch(FileMovedEvent("./root/a.tmp", "./root/a.txt"))
+    handler.flush()
+
+    assert len(handler.event_history) == 1
+    assert handler.current_event["event_type"] == "created"
+    assert handler.current_event["event_location"] == "./root/a.txt"
+
+
+def test_directory_modify_without_children_is_kept():
+    handler = FileHandler(settle_window=10)
+    handler.dispatch(DirCreatedEvent("./root/new_dir"))
+    handler.dispatch(DirModifiedEvent("./other"))
+    handler.flush()
+
+    assert [e["event_type"] for e in handler.event_history] == ["created", "modified"]
+
+
+def test_events_emitted_when_window_closes():
+    handler = FileHandler(settle_window=0.1)
+    handler.dispatch(FileModifiedEvent("./root/a.txt"))
+    assert handler.current_event is None
+
+    time.sleep(0.3)
+    assert handler.current_event["event_location"] == "./root/a.txt"
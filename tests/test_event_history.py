@@ -0,0 +1,53 @@
+import pytest
+from filewatch.event_history import EventHistory
+from filewatch.file_event import FileEvent
+from filewatch.file_watch import FileHandler
+
+
+def make_event(n: int) -> FileEvent:
+    return FileEvent("created", f"./file_{n}.txt")
+
+
+def test_history_is_bounded():
+    """Test that the oldest events are discarded once the history is full."""
+    history = EventHistory(capacity=3)
+    events = [history.append(make_event(i)) for i in range(5)]
+
+    assert len(history) == 3
+    assert [e.event_location for e in history] == [
+        "./file_2.txt",
+        "./file_3.txt",
+        "./file_4.txt",
+    ]
+    assert history[-1] is events[4]
+    assert history[0] is events[2]
+
+
+def test_history_last_and_since():
+    """Test reading the tail of the history and the events after a sequence number."""
+    history = EventHistory(capacity=4)
+    events = [history.append(make_event(i)) for i in range(6)]
+
+    assert history.last(2) == events[4:]
+    assert history.last(10) == events[2:]
+    assert history.since(events[3].sequence) == events[4:]
+    assert history.since(-1) == events[2:]
+    assert history.since(events[5].sequence) == []
+
+
+def test_empty_history():
+    history = EventHistory()
+    assert not history
+    with pytest.raises(IndexError):
+        history[-1]
+
+
+def test_invalid_capacity():
+    with pytest.raises(ValueError):
+        EventHistory(capacity=0)
+
+
+def test_handler_history_capacity():
+    handler = FileHandler(history_capacity=5)
+    assert handler.event_history.capacity == 5
+    assert handler.recent_events(3) == []
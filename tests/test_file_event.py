@@ -0,0 +1,50 @@
+import datetime as dt
+import pytest
+from watchdog.events import FileModifiedEvent
+from filewatch.file_event import FileEvent
+from filewatch.file_watch import FileHandler
+
+
+def test_sequence_numbers_increase():
+    first = FileEvent("created", "./a.txt")
+    second = FileEvent("deleted", "./b.txt")
+
+    assert second.sequence > first.sequence
+
+
+def test_event_is_immutable():
+    event = FileEvent("created", "./a.txt")
+    with pytest.raises(AttributeError):
+        event.event_type = "deleted"
+
+
+def test_to_row():
+    when = dt.datetime(2023, 10, 1, 12, 0, 0)
+    event = FileEvent(
+        "moved", "./a.txt", file_destination="./b.txt", event_time=when
+    )
+
+    assert event.file_type == ".txt"
+    assert event.to_row() == (when.timestamp(), "moved", "./a.txt", ".txt", "./b.txt")
+
+
+def test_subscript_access():
+    """Test that events can still be read like the old event dictionaries."""
+    event = FileEvent("created", "./a.txt")
+
+    assert event["event_type"] == "created"
+    assert "file_destination" not in event.keys()
+    with pytest.raises(KeyError):
+        event["file_destination"]
+
+
+def test_emitted_sequence_is_monotonic():
+    """Test that observers see increasing sequence numbers after coalescing."""
+    handler = FileHandler(settle_window=10)
+    handler.dispatch(FileModifiedEvent("./root/a.txt"))
+    handler.dispatch(FileModifiedEvent("./root/b.txt"))
+    handler.dispatch(FileModifiedEvent("./root/a.txt"))
+    handler.flush()
+
+    sequences = [e.sequence for e in handler.event_history]
+    assert sequences == sorted(sequences)
@@ -0,0 +1,67 @@
+from watchdog.events import FileCreatedEvent, FileModifiedEvent, FileMovedEvent
+from filewatch.file_watch import FileHandler
+from filewatch.path_filter import COMMON_IGNORED_DIRECTORIES, PathFilter
+
+
+def test_extension_filter():
+    path_filter = PathFilter(extensions=[".txt", ".py"])
+
+    assert path_filter.matches("./root/a.txt")
+    assert path_filter.matches("./root/b.py")
+    assert not path_filter.matches("./root/c.sql")
+    assert not path_filter.matches("./root/sub", is_directory=True)
+
+
+def test_include_and_exclude_globs():
+    path_filter = PathFilter(include=["*.py", "*/docs/*"], exclude=["test_*"])
+
+    assert path_filter.matches("./src/module.py")
+    assert path_filter.matches("./src/docs/index.md")
+    assert not path_filter.matches("./src/test_module.py")
+    assert not path_filter.matches("./src/module.c")
+
+
+def test_ignored_directories():
+    path_filter = PathFilter(ignore_dirs=COMMON_IGNORED_DIRECTORIES + ("build/",))
+
+    assert not path_filter.matches("./repo/.git/objects/ab/cdef")
+    assert not path_filter.matches("./repo/node_modules/pkg/index.js")
+    assert not path_filter.matches("./repo/build", is_directory=True)
+    assert path_filter.matches("./repo/src/build.py")
+
+
+def test_ds_store_ignored_by_default():
+    assert not PathFilter().matches("./root/.DS_Store")
+    assert PathFilter(ignore_names=()).matches("./root/.DS_Store")
+
+
+def test_decisions_are_cached():
+    path_filter = PathFilter(extensions=[".txt"])
+    for _ in range(10):
+        path_filter.matches("./root/a.txt")
+
+    info = path_filter.cache_info()
+    assert info.misses == 1
+    assert info.hits == 9
+
+
+def test_handler_applies_filter_to_all_events():
+    """Test that the handler filter covers created, modified and moved events."""
+    handler = FileHandler(
+        settle_window=10, path_filter=PathFilter(ignore_dirs=[".git"])
+    )
+    handler.dispatch(FileCreatedEvent("./repo/.git/index.lock"))
+    handler.dispatch(FileModifiedEvent("./repo/.git/index"))
+    handler.dispatch(FileMovedEvent("./repo/.git/a", "./repo/.git/b"))
+    handler.dispatch(FileCreatedEvent("./repo/main.py"))
+    handler.flush()
+
+    assert [e["event_location"] for e in handler.event_history] == ["./repo/main.py"]
+
+
+def test_watched_extension_updates_filter():
+    handler = FileHandler(path_filter=PathFilter(ignore_dirs=[".git"]))
+    handler.watched_extension = [".py"]
+
+    assert handler.path_filter.extensions == {".py"}
+    assert handler.path_filter.ignore_dirs == {".git"}